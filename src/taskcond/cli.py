@@ -1,3 +1,4 @@
+import functools
 import importlib.util
 import shlex
 import sys
@@ -11,6 +12,40 @@ import click
 from taskcond.core import TaskManager, TaskOrchestrator
 
 
+@functools.lru_cache(maxsize=8)
+def _load_taskcond_table(
+    pyproject_path: Path, mtime_ns: int, size: int
+) -> dict[str, Any]:
+    """
+    Load the `[tool.taskcond]` table from a `pyproject.toml` file.
+
+    The result is cached, and the file is only parsed again when its
+    modification time or size changes. Callers must not modify the
+    returned dictionary.
+
+    Parameters
+    ----------
+    pyproject_path : Path
+        The absolute path to the `pyproject.toml` file.
+    mtime_ns : int
+        The modification time of the file in nanoseconds.
+    size : int
+        The size of the file in bytes.
+
+    Returns
+    -------
+    dict[str, Any]
+        The `[tool.taskcond]` table, or an empty dictionary if it is missing.
+    """
+    with open(pyproject_path, "rb") as f:
+        data = tomllib.load(f)
+
+    # Safely get the [tool.taskcond] table
+    tool_dict = data.get("tool", {})
+    taskcond_dict: dict[str, Any] = tool_dict.get("taskcond", {})
+    return taskcond_dict
+
+
 @dataclass
 class RunConfig:
     """
@@ -29,7 +64,8 @@ class RunConfig:
     n_jobs : int | None
         The number of parallel workers to use for execution.
     use_processes : bool
-        If True, use `ProcessPoolExecutor` instead of `ThreadPoolExecutor`.
+        If True, use `ProcessPoolExecutor` instead of `ThreadPoolExecutor`
+        for tasks with a Python function.
     visible_progressbar : bool
         If True, the progress bar will be displayed during execution.
     """
@@ -63,12 +99,12 @@ class RunConfig:
         pyproject_path = Path("pyproject.toml")
         taskcond_dict: dict[str, Any] = {}
         if pyproject_path.is_file():
-            with open(pyproject_path, "rb") as f:
-                data = tomllib.load(f)
-
-                # Safely get the [tool.taskcond] table
-                tool_dict = data.get("tool", {})
-                taskcond_dict = tool_dict.get("taskcond", {})
+            stat = pyproject_path.stat()
+            taskcond_dict = dict(
+                _load_taskcond_table(
+                    pyproject_path.resolve(), stat.st_mtime_ns, stat.st_size
+                )
+            )
 
         # CLI arguments override pyproject.toml settings
         taskcond_dict.update(kwargs)
@@ -103,6 +139,9 @@ class RunConfig:
             raise ValueError(f"Error: Task file '{self.taskfile}' not found.")
 
         module_name = f"user_tasks_{self.taskfile.stem.replace('.', '_')}"
+        # For a `.py` file this uses a SourceFileLoader, which reuses the
+        # bytecode cached in `__pycache__` while the source's mtime and size
+        # are unchanged, so the task file is only compiled after it changes.
         spec = importlib.util.spec_from_file_location(module_name, self.taskfile)
         if spec is None or spec.loader is None:
             raise RuntimeError(
@@ -145,7 +184,7 @@ def cli() -> None:
 @click.option(
     "--use_processes",
     is_flag=True,
-    help="Use ProcessPoolExecutor instead of ThreadPoolExecutor for parallel execution.",
+    help="Use ProcessPoolExecutor instead of ThreadPoolExecutor for Python function tasks.",
 )
 @click.option(
     "--visible_progressbar",
@@ -250,15 +289,17 @@ def list_tasks() -> None:
     if not all_tasks:
         raise RuntimeError(f"No tasks found in '{config.taskfile}'.")
 
-    print("Available Tasks:")
+    # Collect the lines and write them at once.
+    parts: list[str] = ["Available Tasks:\n"]
     for task in all_tasks:
-        print(f"  {task.name}: {task.description}")
+        parts.append(f"  {task.name}: {task.description}\n")
         if task.depends:
-            print(f"    Depends on: {', '.join(task.depends)}")
+            parts.append(f"    Depends on: {', '.join(task.depends)}\n")
         if task.output_files is not None:
-            print(f"    Outputs: {', '.join(map(str, task.output_files))}")
+            parts.append(f"    Outputs: {', '.join(map(str, task.output_files))}\n")
         if task.input_files is not None:
-            print(f"    Inputs: {', '.join(map(str, task.input_files))}")
+            parts.append(f"    Inputs: {', '.join(map(str, task.input_files))}\n")
+    click.echo("".join(parts), nl=False)
 
     # After listing, validate the graph for any cyclic dependencies.
     try:
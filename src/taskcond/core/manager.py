@@ -1,21 +1,11 @@
-from enum import Enum, auto
+from array import array
+from collections import deque
+from collections.abc import KeysView
 from types import MappingProxyType
 
 from .task import Task
 
 
-class VisitStatus(Enum):
-    """
-    Enumeration for the visitation status of a task during graph traversal.
-
-    This is used for cycle detection within the task dependency graph.
-    """
-
-    UNVISITED = auto()  # The node has not been visited yet.
-    VISITING = auto()  # The node is currently in the recursion stack.
-    VISITED = auto()  # The node and all its descendants have been fully visited.
-
-
 class TaskManager:
     """
     A singleton class to manage the registration and retrieval of tasks.
@@ -27,18 +17,37 @@ class TaskManager:
 
     def __new__(cls) -> "TaskManager":
         """
-        Creates and returns the singleton instance of the TaskManager.
+        Returns the singleton instance of the TaskManager.
+
+        The instance is created when this module is loaded, so no check
+        for its existence is needed here.
         """
-        if not hasattr(cls, "_instance"):
-            # Create the singleton instance if it doesn't exist.
-            cls._instance = super(TaskManager, cls).__new__(cls)
-            # Call the one-time initializer.
-            cls._instance.__initialize_once__()
-        return cls._instance
+        return _MANAGER
 
     def __initialize_once__(self) -> None:
-        """Initializes the internal task storage. Called only once."""
+        """
+        Initializes the internal task storage.
+
+        Called only once, when the singleton instance is created.
+        """
         self.__tasks: dict[str, Task] = {}
+        # A read-only view that reflects later changes to `__tasks`.
+        self.__task_dicts_proxy = MappingProxyType(self.__tasks)
+        # Fingerprint of the task graph that last passed `validate_cycles`.
+        self.__cycle_cache_key: tuple[tuple[str, tuple[str, ...]], ...] | None = None
+
+    @classmethod
+    def reset(cls) -> None:
+        """
+        Removes all registered tasks and cached validation results from the
+        singleton instance.
+
+        The instance and its task dictionary are cleared in place, so existing
+        references to them and the views returned by `task_dicts` and
+        `task_names` stay valid.
+        """
+        _MANAGER.__tasks.clear()
+        _MANAGER.__cycle_cache_key = None
 
     def register(self, task: Task) -> None:
         """
@@ -54,21 +63,25 @@ class TaskManager:
         ValueError
             If a task with the same name is already registered.
         """
-        if task.name in self.__tasks.keys():
+        if task.name in self.__tasks:
             raise ValueError(f"Task with name '{task.name}' already registered.")
         self.__tasks[task.name] = task
+        self.__cycle_cache_key = None
 
     @property
     def task_dicts(self) -> MappingProxyType[str, Task]:
         """
         Returns a read-only view of the tasks dictionary.
 
+        The same view is returned on every access and always reflects the
+        currently registered tasks.
+
         Returns
         -------
         MappingProxyType[str, Task]
             A dictionary-like object mapping task names to Task instances.
         """
-        return MappingProxyType(self.__tasks)
+        return self.__task_dicts_proxy
 
     @property
     def tasks(self) -> list[Task]:
@@ -83,16 +96,18 @@ class TaskManager:
         return list(self.__tasks.values())
 
     @property
-    def task_names(self) -> list[str]:
+    def task_names(self) -> KeysView[str]:
         """
-        Returns a list of all registered task names.
+        Returns a view of all registered task names.
+
+        The view always reflects the currently registered tasks.
 
         Returns
         -------
-        list[str]
-            A list of the names of all tasks.
+        KeysView[str]
+            A set-like view of the names of all tasks.
         """
-        return list(self.__tasks.keys())
+        return self.__tasks.keys()
 
     def get_task(self, name: str) -> Task:
         """
@@ -113,16 +128,20 @@ class TaskManager:
         ValueError
             If no task with the given name is found.
         """
-        if name not in self.__tasks.keys():
+        # A single lookup on the common path; the message is only built on a miss.
+        task = self.__tasks.get(name)
+        if task is None:
             raise ValueError(f"Task '{name}' is not defined.")
-        return self.__tasks[name]
+        return task
 
     def validate_cycles(self) -> None:
         """
         Validates the task dependency graph for cycles.
 
-        This method performs a Depth-First Search (DFS) traversal of the graph
-        to ensure there are no cyclic dependencies among the registered tasks.
+        This method uses Kahn's algorithm to topologically sort the registered
+        tasks iteratively. Any task that cannot be sorted is part of (or depends
+        on) a cycle, which is then reconstructed for the error message.
+        The result of a successful check is cached until the graph changes.
 
         Raises
         ------
@@ -130,61 +149,67 @@ class TaskManager:
             If a task depends on an unregistered task.
             If a cyclic dependency is detected in the graph.
         """
-        # A dictionary to track the visitation status of each task (node).
-        task_status_dict: dict[str, VisitStatus] = {
-            task.name: VisitStatus.UNVISITED for task in self.tasks
-        }
-        # A stack to keep track of the current traversal path.
-        # This is used to report the exact cycle if one is found.
-        recursion_stack: list[str] = []
-
-        def dfs_visit(task: Task) -> None:
-            """
-            A recursive helper function for performing DFS to detect cycles.
-
-            This function is nested to have access to `task_status_dict` and
-            `recursion_stack` from the outer scope.
-
-            Parameters
-            ----------
-            task : Task
-                The current task (node) being visited in the traversal.
-            """
-            # Mark the current task as 'visiting' and add it to the recursion path.
-            task_status_dict[task.name] = VisitStatus.VISITING
-            recursion_stack.append(task.name)
-
-            # Recursively visit all dependencies of the current task.
+        # Skip the traversal if this exact graph has already been validated.
+        # Tasks are kept in registration order, so no sorting is needed.
+        cache_key = tuple((name, task.depends) for name, task in self.__tasks.items())
+        if cache_key == self.__cycle_cache_key:
+            return
+
+        # Number the tasks (nodes) so that the traversal state can be kept
+        # in flat arrays indexed by these ids instead of dicts keyed by names.
+        names = list(self.__tasks)
+        ids = {name: i for i, name in enumerate(names)}
+        # The ids of the dependencies of each task, and of the tasks that
+        # depend on each task (reverse edges).
+        dependencies: list[list[int]] = [[] for _ in names]
+        successors: list[list[int]] = [[] for _ in names]
+        for i, task in enumerate(self.__tasks.values()):
             for dep_name in task.depends:
+                dep_id = ids.get(dep_name)
                 # Check for unregistered tasks.
-                if dep_name not in self.__tasks:
+                if dep_id is None:
                     raise ValueError(
                         f"Task '{task.name}' depends on unknown task '{dep_name}'. "
                         + "Please ensure all dependencies are registered tasks."
                     )
-
-                # If a dependency is already in the 'visiting' state, we have found a cycle.
-                if task_status_dict[dep_name] == VisitStatus.VISITING:
-                    # Reconstruct the cycle path from the recursion stack for a clear error message.
-                    cycle_start_index = recursion_stack.index(dep_name)
-                    cycle_path_list = recursion_stack[cycle_start_index:] + [dep_name]
-                    cycle_path = " -> ".join(cycle_path_list)
-                    raise ValueError(f"Cyclic dependency detected: {cycle_path}")
-
-                # If the dependency hasn't been visited yet, recurse into it.
-                if task_status_dict[dep_name] == VisitStatus.UNVISITED:
-                    dep_task = self.get_task(dep_name)
-                    dfs_visit(dep_task)
-
-            # Backtrack: remove the task from the path and mark it as fully 'visited'.
-            recursion_stack.pop()
-            task_status_dict[task.name] = VisitStatus.VISITED
-
-        # Iterate through all tasks to handle disconnected components in the graph.
-        for task in self.tasks:
-            # If a task hasn't been visited yet, start a new DFS traversal from it.
-            if task_status_dict[task.name] == VisitStatus.UNVISITED:
-                dfs_visit(task)
+                dependencies[i].append(dep_id)
+                successors[dep_id].append(i)
+        # The number of unresolved dependencies of each task.
+        in_degree = array("i", map(len, dependencies))
+
+        # Repeatedly resolve tasks whose dependencies are all resolved.
+        queue = deque(i for i, degree in enumerate(in_degree) if degree == 0)
+        n_resolved = 0
+        while len(queue) != 0:
+            i = queue.popleft()
+            n_resolved += 1
+            for successor in successors[i]:
+                in_degree[successor] -= 1
+                if in_degree[successor] == 0:
+                    queue.append(successor)
+
+        if n_resolved == len(names):
+            self.__cycle_cache_key = cache_key
+            return
+
+        # Every unresolved task has at least one unresolved dependency, so
+        # following those dependencies from any unresolved task must end up
+        # in a cycle. Walk until a task repeats to report the exact cycle.
+        path: list[int] = []
+        on_path = bytearray(len(names))
+        i = next(i for i, degree in enumerate(in_degree) if degree > 0)
+        while not on_path[i]:
+            on_path[i] = 1
+            path.append(i)
+            i = next(dep_id for dep_id in dependencies[i] if in_degree[dep_id] > 0)
+        cycle = path[path.index(i) :] + [i]
+        cycle_path = " -> ".join(names[j] for j in cycle)
+        raise ValueError(f"Cyclic dependency detected: {cycle_path}")
+
+
+# The singleton instance, created once when the module is loaded.
+_MANAGER = object.__new__(TaskManager)
+_MANAGER.__initialize_once__()
 
 
 def register(task: Task) -> None:
@@ -1,14 +1,19 @@
+import multiprocessing
 import os
-import time
 from collections import defaultdict, deque
+from collections.abc import Iterable, Mapping
 from concurrent.futures import (
+    FIRST_COMPLETED,
     Executor,
     Future,
     ProcessPoolExecutor,
     ThreadPoolExecutor,
+    wait,
 )
+from contextlib import ExitStack
 from dataclasses import dataclass
 from enum import IntEnum, auto
+from pathlib import Path
 
 from tqdm import tqdm
 
@@ -16,6 +21,29 @@ from .manager import TaskManager
 from .task import Task
 
 
+def _execute_registered_task(task_name: str, task_args: list[str]) -> None:
+    """
+    Executes a task registered with the TaskManager, looked up by its name.
+
+    This is the entry point of forked process pool workers, which inherit the
+    TaskManager of the parent process, so the task does not have to be pickled.
+
+    Parameters
+    ----------
+    task_name : str
+        The name of the task to execute.
+    task_args : list[str]
+        The task optional arguments.
+    """
+    TaskManager().get_task(task_name).execute(task_args)
+
+
+def _start_worker() -> None:
+    """
+    Does nothing. Submitted to a process pool to start its workers.
+    """
+
+
 class RunStatus(IntEnum):
     """
     Enumeration for the execution status of a task during orchestration.
@@ -61,6 +89,34 @@ class RemainingDependenciesCount:
         return self.__count == 0
 
 
+class FinishedTasksCount:
+    """
+    A simple counter to track the number of finished tasks during a run.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the counter to zero."""
+        self.__count = 0
+
+    def increment(self) -> None:
+        """
+        Increments the internal counter by one.
+        """
+        self.__count += 1
+
+    @property
+    def count(self) -> int:
+        """
+        Returns the current count.
+
+        Returns
+        -------
+        int
+            The number of finished tasks.
+        """
+        return self.__count
+
+
 @dataclass
 class TaskState:
     """
@@ -70,6 +126,7 @@ class TaskState:
     task: Task
     status: RunStatus
     remaining_dependencies_count: RemainingDependenciesCount
+    should_run_cache: bool | None = None
 
     @classmethod
     def create(cls, task: Task) -> "TaskState":
@@ -103,12 +160,46 @@ class TaskState:
         return (
             self.status == RunStatus.PENDING
             and self.remaining_dependencies_count.is_zero
-            and (
-                (self.task.input_files is None)
-                or all(input.is_file() for input in self.task.input_files)
-            )
+            and self.inputs_available()
         )
 
+    def inputs_available(
+        self, mtime_cache: Mapping[Path, int | None] | None = None
+    ) -> bool:
+        """
+        Checks if all the input files of the task exist.
+
+        Parameters
+        ----------
+        mtime_cache : Mapping[Path, int | None] | None, default None
+            Known modification times of regular files. Input files with a
+            known modification time are not looked up again. Other input
+            files, including those known to be missing, are checked on the
+            file system, as they may be created while the task is waiting.
+        """
+        return (self.task.input_files is None) or all(
+            (mtime_cache is not None and mtime_cache.get(input) is not None)
+            or input.is_file()
+            for input in self.task.input_files
+        )
+
+    def should_run(self, mtime_cache: Mapping[Path, int | None] | None = None) -> bool:
+        """
+        Returns the result of the task's `should_run()`, evaluated at most once.
+
+        A task is checked when it is about to be submitted or skipped. Only
+        a task deferred for a free worker is checked again, and it has to run
+        in any case, so the result never needs to be discarded during a run.
+
+        Parameters
+        ----------
+        mtime_cache : Mapping[Path, int | None] | None, default None
+            Known modification times of files, passed to the task's `should_run()`.
+        """
+        if self.should_run_cache is None:
+            self.should_run_cache = self.task.should_run(mtime_cache)
+        return self.should_run_cache
+
     @property
     def is_pending(self) -> bool:
         """Checks if the task is in the PENDING state."""
@@ -125,6 +216,19 @@ class TaskState:
         return self.status in [RunStatus.COMPLETED, RunStatus.SKIPPED, RunStatus.FAILED]
 
 
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """
+    The structure of the execution graph for a set of target tasks.
+
+    It only depends on the registered tasks, so it can be reused by later
+    runs of the same targets. It must not be modified.
+    """
+
+    tasks: tuple[Task, ...]
+    reverse_dependencies: dict[str, set[Task]]
+
+
 class TaskOrchestrator:
     """
     Coordinates the execution of a graph of tasks.
@@ -154,10 +258,12 @@ class TaskOrchestrator:
             If None, it defaults to 1 (sequential execution).
             If -1, it uses the number of CPUs.
         use_processes : bool, default False
-            If True, uses ProcessPoolExecutor for execution.
-            If False, uses ThreadPoolExecutor.
+            If True, tasks with a Python function are executed in a
+            ProcessPoolExecutor. Tasks with only a shell command always run
+            in a ThreadPoolExecutor, as the command has its own process.
         check_freq : float, default 0.1
-            The frequency in seconds to check for completed tasks.
+            The maximum interval in seconds between checks for the input files
+            of tasks waiting on them. Completed tasks are processed immediately.
 
         """
         # Validate the dependency graph for cycles before proceeding.
@@ -166,14 +272,17 @@ class TaskOrchestrator:
         if max_workers is None:
             max_workers = 1
         if max_workers == -1:
-            max_workers = os.cpu_count()
+            max_workers = os.cpu_count() or 1
 
         self.__task_manager = task_manager
         self.__max_workers = max_workers
-        self.__cls_executor = (
-            ProcessPoolExecutor if use_processes else ThreadPoolExecutor
-        )
+        self.__use_processes = use_processes
+        # Whether process pool workers are forked, and so inherit the tasks
+        # registered in this process. Determined when the pool is created.
+        self.__workers_inherit_tasks = False
         self.__check_freq = check_freq
+        # Execution plans of previous runs, keyed by the target task names.
+        self.__plan_cache: dict[tuple[str, ...], ExecutionPlan] = {}
 
     def run_tasks(
         self,
@@ -202,22 +311,62 @@ class TaskOrchestrator:
             self.__build_execution_graph(target_tasks_names)
         )
 
+        # Scan the modification times of all files the tasks refer to at once.
+        mtime_cache = self.__scan_mtimes(task_states)
+
+        # The number of tasks that have finished, to detect the end of the run.
+        finished_tasks_count = FinishedTasksCount()
+
+        # Tasks whose dependencies are all met, in the order they became ready.
+        ready_tasks: deque[Task] = deque(
+            task
+            for task, state in task_states.items()
+            if state.remaining_dependencies_count.is_zero
+        )
+
         future_dict: dict[Future[None], Task] = {}
-        with (
-            self.__cls_executor(max_workers=self.__max_workers) as executor,
-            tqdm(
-                total=total_tasks_to_run,
-                unit="task",
-                desc="Overall Progress",
-                disable=tqdm_disable,
-            ) as pbar,
-        ):
+        with ExitStack() as stack:
+            # Threads are only started on demand, so the thread pool is cheap
+            # to create even if every task ends up in the process pool.
+            executor = stack.enter_context(
+                ThreadPoolExecutor(max_workers=self.__max_workers)
+            )
+            # The process pool is only started if the execution graph
+            # contains any task that has to run in a separate process.
+            process_executor: Executor | None = None
+            if any(self.__runs_in_process(task) for task in task_states):
+                mp_context = multiprocessing.get_context()
+                self.__workers_inherit_tasks = mp_context.get_start_method() == "fork"
+                process_executor = stack.enter_context(
+                    ProcessPoolExecutor(
+                        max_workers=self.__max_workers, mp_context=mp_context
+                    )
+                )
+                # Forked workers are all started on the first submission.
+                # Start them now, before the thread pool and the progress bar
+                # start any thread, as a child forked from a multi-threaded
+                # process may inherit a lock held by another thread.
+                if self.__workers_inherit_tasks:
+                    process_executor.submit(_start_worker)
+            pbar = stack.enter_context(
+                tqdm(
+                    total=total_tasks_to_run,
+                    unit="task",
+                    desc="Overall Progress",
+                    disable=tqdm_disable,
+                )
+            )
+
             # 2. Submit initial tasks that have no dependencies.
             self.__do_ready_tasks(
                 pbar,
                 executor,
+                process_executor,
                 task_states,
                 reverse_dependencies,
+                ready_tasks,
+                mtime_cache,
+                finished_tasks_count,
                 future_dict,
                 force,
                 task_args_map,
@@ -226,49 +375,11 @@ class TaskOrchestrator:
             # 3. Main loop: monitor running tasks and submit new ones as they become ready.
             while True:
                 # Exit condition: all tasks have reached a finished state.
-                if all(state.is_finished for state in task_states.values()):
+                if finished_tasks_count.count == total_tasks_to_run:
                     break
 
-                # 4. Process completed futures.
-                completed_futures: list[Future[None]] = []
-                for future, task in future_dict.items():
-                    if future.done():
-                        completed_futures.append(future)
-                        exception = future.exception()
-                        if exception is not None:
-                            # The task raised an exception.
-                            print(f"\nTask '{task.name}' failed: {exception}")
-                            status = RunStatus.FAILED
-                        else:
-                            # The task completed without errors.
-                            status = RunStatus.COMPLETED
-                        # Mark the task as completed/failed and update dependencies.
-                        self.__mark_task_completed(
-                            pbar, task_states, reverse_dependencies, task, status
-                        )
-
-                # Remove completed futures from the dictionary of running tasks.
-                future_dict = {
-                    future: task
-                    for future, task in future_dict.items()
-                    if future not in completed_futures
-                }
-
-                # 5. Submit any new tasks that are now ready to run.
-                self.__do_ready_tasks(
-                    pbar,
-                    executor,
-                    task_states,
-                    reverse_dependencies,
-                    future_dict,
-                    force,
-                    task_args_map,
-                )
-
                 # Deadlock/Stall detection: No tasks are running, but some are still pending.
-                if len(future_dict) == 0 and any(
-                    state.is_pending for state in task_states.values()
-                ):
+                if len(future_dict) == 0:
                     print("\n")
                     print(
                         "Warning: No runnable tasks are currently submitted, but some tasks are still pending."
@@ -277,8 +388,49 @@ class TaskOrchestrator:
                     )
                     break
 
-                # 6. Wait for a short interval before checking again.
-                time.sleep(self.__check_freq)
+                # 4. Wait until a running task finishes. The timeout lets tasks
+                # waiting for their input files be checked again periodically.
+                completed_futures, _ = wait(
+                    future_dict, timeout=self.__check_freq, return_when=FIRST_COMPLETED
+                )
+
+                # 5. Process completed futures.
+                for future in completed_futures:
+                    task = future_dict.pop(future)
+                    exception = future.exception()
+                    if exception is not None:
+                        # The task raised an exception.
+                        print(f"\nTask '{task.name}' failed: {exception}")
+                        status = RunStatus.FAILED
+                    else:
+                        # The task completed without errors.
+                        status = RunStatus.COMPLETED
+                    # Mark the task as completed/failed and update dependencies.
+                    self.__mark_task_completed(
+                        pbar,
+                        task_states,
+                        reverse_dependencies,
+                        ready_tasks,
+                        mtime_cache,
+                        finished_tasks_count,
+                        task,
+                        status,
+                    )
+
+                # 6. Submit any new tasks that are now ready to run.
+                self.__do_ready_tasks(
+                    pbar,
+                    executor,
+                    process_executor,
+                    task_states,
+                    reverse_dependencies,
+                    ready_tasks,
+                    mtime_cache,
+                    finished_tasks_count,
+                    future_dict,
+                    force,
+                    task_args_map,
+                )
 
         # Final summary report.
         print("\n")
@@ -300,9 +452,8 @@ class TaskOrchestrator:
         """
         Builds the necessary data structures for task execution.
 
-        This method performs a traversal of the dependency graph starting from
-        the target tasks to identify all tasks that need to be considered for
-        execution.
+        The structure of the graph is taken from the execution plan for the
+        target tasks, and fresh task states are created for this run.
 
         Parameters
         ----------
@@ -321,33 +472,146 @@ class TaskOrchestrator:
         if len(target_tasks_names) == 0:
             raise ValueError("No target tasks specified for execution.")
 
+        plan = self.__get_execution_plan(target_tasks_names)
+
+        # Build initial task states. The plan itself is only read from.
+        task_states = {task: TaskState.create(task) for task in plan.tasks}
+
+        return len(plan.tasks), task_states, plan.reverse_dependencies
+
+    def __get_execution_plan(self, target_tasks_names: list[str]) -> ExecutionPlan:
+        """
+        Returns the execution plan for the target tasks, reusing a cached one.
+
+        A cached plan is reused as long as every task in it is still the task
+        registered under its name. Dependencies are resolved by name, so the
+        traversal from the targets would then produce the same plan again.
+
+        Parameters
+        ----------
+        target_tasks_names : list[str]
+            The names of the final target tasks.
+
+        Returns
+        -------
+        ExecutionPlan
+            The execution plan for the target tasks.
+        """
+        cache_key = tuple(target_tasks_names)
+        plan = self.__plan_cache.get(cache_key)
+        task_dicts = self.__task_manager.task_dicts
+        if plan is None or any(
+            task_dicts.get(task.name) is not task for task in plan.tasks
+        ):
+            plan = self.__build_execution_plan(target_tasks_names)
+            self.__plan_cache[cache_key] = plan
+        return plan
+
+    def __build_execution_plan(self, target_tasks_names: list[str]) -> ExecutionPlan:
+        """
+        Builds the execution plan for the target tasks.
+
+        This method performs a traversal of the dependency graph starting from
+        the target tasks to identify all tasks that need to be considered for
+        execution, and precomputes the mapping used while scheduling them.
+
+        Parameters
+        ----------
+        target_tasks_names : list[str]
+            The names of the final target tasks.
+
+        Returns
+        -------
+        ExecutionPlan
+            The execution plan for the target tasks.
+        """
         # Collect all tasks required for the run (targets and their dependencies).
+        # Each name is only enqueued once, so shared dependencies are not
+        # traversed again, and the order of discovery is kept.
         all_tasks: list[Task] = []
-        queue = deque(target_tasks_names)
+        seen_names = set(target_tasks_names)
+        queue = deque(dict.fromkeys(target_tasks_names))
         while len(queue) != 0:
             task_name = queue.popleft()
             task = self.__task_manager.get_task(task_name)
-            if task not in all_tasks:
-                all_tasks.append(task)
+            all_tasks.append(task)
             for dep_name in task.depends:
-                queue.append(dep_name)
-
-        # Build initial task states and the reverse dependency mapping.
-        task_states: dict[Task, TaskState] = {}
-        reverse_dependencies: dict[str, set[Task]] = defaultdict(lambda: set())
+                if dep_name not in seen_names:
+                    seen_names.add(dep_name)
+                    queue.append(dep_name)
+
+        # Build the reverse dependency mapping. Every task gets an entry, so
+        # looking up a task never inserts into the (shared) plan.
+        reverse_dependencies: dict[str, set[Task]] = {
+            task.name: set() for task in all_tasks
+        }
         for task in all_tasks:
-            task_states[task] = TaskState.create(task)
             for dep_name in task.depends:
                 reverse_dependencies[dep_name].add(task)
 
-        return (len(all_tasks), task_states, reverse_dependencies)
+        return ExecutionPlan(tuple(all_tasks), reverse_dependencies)
+
+    @staticmethod
+    def __scan_mtimes(tasks: Iterable[Task]) -> dict[Path, int | None]:
+        """
+        Collects the modification times of the input and output files of tasks.
+
+        Each directory containing such files is listed once with `os.scandir`,
+        and each file found in it is stat'ed once, even if it is shared
+        between tasks. The listing goes through every entry of the directory,
+        so this mostly saves the lookups of missing files, which are mapped
+        to None. Entries that are not regular files, such as directories,
+        are left out, so they are looked up on the file system like any
+        file that was not scanned.
+
+        Parameters
+        ----------
+        tasks : Iterable[Task]
+            The tasks whose files should be scanned.
+
+        Returns
+        -------
+        dict[Path, int | None]
+            A dictionary mapping file paths to their modification times in
+            nanoseconds, or None if they do not exist.
+        """
+        # Group the file names to look for by their directory.
+        file_names_by_dir: dict[Path, set[str]] = defaultdict(lambda: set())
+        for task in tasks:
+            for path in (task.input_files or ()) + (task.output_files or ()):
+                file_names_by_dir[path.parent].add(path.name)
+
+        mtime_cache: dict[Path, int | None] = {}
+        for dir_path, file_names in file_names_by_dir.items():
+            # Files that are not found in the directory are missing.
+            for file_name in file_names:
+                mtime_cache[dir_path / file_name] = None
+            try:
+                with os.scandir(dir_path) as entries:
+                    for entry in entries:
+                        if entry.name not in file_names:
+                            continue
+                        if entry.is_file():
+                            mtime_cache[dir_path / entry.name] = (
+                                entry.stat().st_mtime_ns
+                            )
+                        else:
+                            del mtime_cache[dir_path / entry.name]
+            except (FileNotFoundError, NotADirectoryError):
+                # The directory does not exist yet, so neither do its files.
+                continue
+        return mtime_cache
 
     def __do_ready_tasks(
         self,
         progress_bar: tqdm,  # type: ignore
         executor: Executor,
+        process_executor: Executor | None,
         task_states: dict[Task, TaskState],
         reverse_dependencies: dict[str, set[Task]],
+        ready_tasks: deque[Task],
+        mtime_cache: dict[Path, int | None],
+        finished_tasks_count: FinishedTasksCount,
         future_dict: dict[Future[None], Task],
         force: bool = False,
         task_args_map: dict[str, list[str]] | None = None,
@@ -356,18 +620,30 @@ class TaskOrchestrator:
         Identifies and submits ready tasks to the executor.
 
         A task is "ready" if it is in the PENDING state and all its
-        dependencies have been met.
+        dependencies have been met. Only the tasks in `ready_tasks` are
+        considered; those still waiting for their input files, or for a free
+        worker, are kept in it.
 
         Parameters
         ----------
         progress_bar : tqdm
             The progress bar instance to update.
         executor : Executor
-            The thread or process pool executor to submit tasks to.
+            The thread pool executor to submit tasks to.
+        process_executor : Executor | None
+            The process pool executor to submit tasks running in a separate
+            process to. If None, all tasks are submitted to `executor`.
         task_states : dict[Task, TaskState]
             The current state of all tasks.
         reverse_dependencies : dict[str, set[Task]]
             The reverse dependency graph.
+        ready_tasks : deque[Task]
+            The tasks whose dependencies have all been met.
+        mtime_cache : dict[Path, int | None]
+            The modification times of the task files, scanned at the start
+            of the run.
+        finished_tasks_count : FinishedTasksCount
+            The number of tasks that have reached a terminal state.
         future_dict : dict[Future[None], Task]
             A dictionary to store the future objects of submitted tasks.
         force : bool
@@ -378,15 +654,30 @@ class TaskOrchestrator:
         if task_args_map is None:
             task_args_map = {}
 
-        for task, state in task_states.items():
-            if not state.is_ready:
+        waiting_tasks: list[Task] = []
+        while len(ready_tasks) != 0:
+            task = ready_tasks.popleft()
+            state = task_states[task]
+            if not state.is_pending:
+                continue
+            if not state.inputs_available(mtime_cache):
+                # The input files are not available yet, so check again later.
+                waiting_tasks.append(task)
                 continue
 
-            if force or task.should_run():
+            if force or state.should_run(mtime_cache):
+                # Respect the worker limit across both executors.
+                if len(future_dict) >= self.__max_workers:
+                    waiting_tasks.append(task)
+                    continue
+
                 # Submit the task for execution.
                 task_states[task].status = RunStatus.RUNNING
                 task_args = task_args_map.get(task.name, [])
-                future = executor.submit(task.execute, task_args)
+                if process_executor is not None and self.__runs_in_process(task):
+                    future = self.__submit_to_process(process_executor, task, task_args)
+                else:
+                    future = executor.submit(task.execute, task_args)
                 future_dict[future] = task
 
             else:
@@ -395,15 +686,79 @@ class TaskOrchestrator:
                     progress_bar,
                     task_states,
                     reverse_dependencies,
+                    ready_tasks,
+                    mtime_cache,
+                    finished_tasks_count,
                     task,
                     RunStatus.SKIPPED,
                 )
+        ready_tasks.extend(waiting_tasks)
+
+    def __submit_to_process(
+        self, process_executor: Executor, task: Task, task_args: list[str]
+    ) -> Future[None]:
+        """
+        Submits a task to the process pool executor.
+
+        Forked workers inherit the registered tasks, so only the task name is
+        sent to them. This lets tasks whose function cannot be pickled, such as
+        lambdas and closures, run in a process pool. Otherwise the task itself
+        is pickled and sent.
+
+        Parameters
+        ----------
+        process_executor : Executor
+            The process pool executor to submit the task to.
+        task : Task
+            The task to execute.
+        task_args : list[str]
+            The task optional arguments.
+
+        Returns
+        -------
+        Future[None]
+            The future of the submitted task.
+        """
+        if (
+            self.__workers_inherit_tasks
+            and self.__task_manager.task_dicts.get(task.name) is task
+        ):
+            return process_executor.submit(
+                _execute_registered_task, task.name, task_args
+            )
+        return process_executor.submit(task.execute, task_args)
+
+    def __runs_in_process(self, task: Task) -> bool:
+        """
+        Checks if a task should be executed in a process pool.
+
+        Shell commands already run in their own process, so a worker thread
+        is enough to wait for them. Only tasks with a Python function are run
+        in a process pool, either when `use_processes` is set or when the
+        task is a CPU-bound function without a shell command.
+
+        Parameters
+        ----------
+        task : Task
+            The task to check.
+
+        Returns
+        -------
+        bool
+            True if the task should run in a process pool, False otherwise.
+        """
+        if task.function is None:
+            return False
+        return self.__use_processes or (task.cpu_bound and task.shell_command is None)
 
     def __mark_task_completed(
         self,
         progress_bar: tqdm,  # type: ignore
         task_states: dict[Task, TaskState],
         reverse_dependencies: dict[str, set[Task]],
+        ready_tasks: deque[Task],
+        mtime_cache: dict[Path, int | None],
+        finished_tasks_count: FinishedTasksCount,
         task: Task,
         status: RunStatus,
     ) -> None:
@@ -420,6 +775,15 @@ class TaskOrchestrator:
             The current state of all tasks.
         reverse_dependencies : dict[str, set[Task]]
             The reverse dependency graph.
+        ready_tasks : deque[Task]
+            The tasks whose dependencies have all been met. Dependents whose
+            last dependency is met by this task are appended to it.
+        mtime_cache : dict[Path, int | None]
+            The modification times of the task files, scanned at the start
+            of the run. Cleared when a task has been executed.
+        finished_tasks_count : FinishedTasksCount
+            The number of tasks that have reached a terminal state.
+            Incremented for this task.
         task : Task
             The task that has just finished.
         status : RunStatus
@@ -432,14 +796,24 @@ class TaskOrchestrator:
 
         # Update the task's status and advance the progress bar.
         task_states[task].status = status
+        finished_tasks_count.increment()
         progress_bar.update(1)
 
+        # A completed task may have rewritten its output files, or touched
+        # files it does not declare, so stop relying on the modification
+        # times scanned at the start of the run.
+        if status == RunStatus.COMPLETED:
+            mtime_cache.clear()
+
         # If the task was successful or skipped, decrement the dependency
         # counter for all tasks that depend on it.
         if status in [RunStatus.COMPLETED, RunStatus.SKIPPED]:
             for dependent_task in reverse_dependencies[task.name]:
-                if task_states[dependent_task].status == RunStatus.PENDING:
-                    task_states[dependent_task].remaining_dependencies_count.countdown()
+                dependent_state = task_states[dependent_task]
+                if dependent_state.status == RunStatus.PENDING:
+                    dependent_state.remaining_dependencies_count.countdown()
+                    if dependent_state.remaining_dependencies_count.is_zero:
+                        ready_tasks.append(dependent_task)
 
         # If the task failed, we must propagate this failure to all
         # downstream tasks that depend on it.
@@ -451,6 +825,9 @@ class TaskOrchestrator:
                     progress_bar,
                     task_states,
                     reverse_dependencies,
+                    ready_tasks,
+                    mtime_cache,
+                    finished_tasks_count,
                     dependent_task,
                     RunStatus.FAILED,
                 )
@@ -1,11 +1,41 @@
+import os
 import shlex
 import subprocess
+import sys
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Callable
 
 
-@dataclass(frozen=True, eq=True, unsafe_hash=True)
+def _get_mtime_ns(
+    path: Path, mtime_cache: Mapping[Path, int | None] | None = None
+) -> int | None:
+    """
+    Returns the modification time of a file in nanoseconds.
+
+    Parameters
+    ----------
+    path : Path
+        The path of the file.
+    mtime_cache : Mapping[Path, int | None] | None, default None
+        Known modification times of files, with None for files known to be
+        missing. Files that are not in it are stat'ed.
+
+    Returns
+    -------
+    int | None
+        The modification time, or None if the file does not exist.
+    """
+    if mtime_cache is not None and path in mtime_cache:
+        return mtime_cache[path]
+    try:
+        return os.stat(path).st_mtime_ns
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+@dataclass(frozen=True, eq=True, unsafe_hash=True, slots=True)
 class Task:
     """
     Represents a single, executable unit of work within a dependency graph.
@@ -34,6 +64,11 @@ class Task:
         A shell command to be executed.
     displayed : bool
         If False, the task will not be displayed in the list of available tasks.
+    cpu_bound : bool
+        If True, the `function` is executed in a separate process so that it
+        does not hold the GIL while other tasks run. Unless the fork start
+        method is used, the function and `args` must then be picklable.
+        Ignored for tasks with a `shell_command`.
     """
 
     name: str
@@ -45,8 +80,21 @@ class Task:
     input_files: tuple[Path, ...] | None = None
     shell_command: str | None = None
     displayed: bool = True
+    cpu_bound: bool = False
 
-    def should_run(self) -> bool:
+    def __post_init__(self) -> None:
+        """
+        Interns the names of the dependencies.
+
+        The names are used as dictionary keys throughout the dependency graph,
+        so interning them lets lookups succeed on the identity check.
+        """
+        # The dataclass is frozen, so bypass its __setattr__.
+        object.__setattr__(
+            self, "depends", tuple(sys.intern(name) for name in self.depends)
+        )
+
+    def should_run(self, mtime_cache: Mapping[Path, int | None] | None = None) -> bool:
         """
         Determines whether the task needs to be executed.
 
@@ -59,6 +107,14 @@ class Task:
         3. If file dependencies are not specified, the task is always considered
            to require execution.
 
+        Parameters
+        ----------
+        mtime_cache : Mapping[Path, int | None] | None, default None
+            Known modification times of files in nanoseconds, e.g. scanned
+            in advance for many tasks at once, with None for files known to
+            be missing. Files that are not in it are looked up on the file
+            system.
+
         Returns
         -------
         bool
@@ -66,27 +122,31 @@ class Task:
         """
         # Case 1: Both input and output files are specified for dependency checking.
         if self.output_files is not None and self.input_files is not None:
-            # If any output file does not exist, the task must be run.
+            # Find the modification time of the oldest output file. If any
+            # output file does not exist, the task must be run.
+            oldest_output_mtime_ns: int | None = None
             for output_file in self.output_files:
-                if not output_file.exists():
+                output_mtime_ns = _get_mtime_ns(output_file, mtime_cache)
+                if output_mtime_ns is None:
                     return True
-
-            # Get the modification time of the most recently updated output file.
-            # Note: This will raise an error if self.output_files is not empty but contains only non-existent files,
-            # but the loop above prevents this scenario.
-            latest_output_mtime = max(
-                f.stat().st_mtime for f in self.output_files if f.exists()
-            )
+                if oldest_output_mtime_ns is None or (
+                    output_mtime_ns < oldest_output_mtime_ns
+                ):
+                    oldest_output_mtime_ns = output_mtime_ns
 
             # Check each input file against the output files.
             for input_file in self.input_files:
+                input_mtime_ns = _get_mtime_ns(input_file, mtime_cache)
                 # If an input file is missing, something is wrong, but we'll
                 # let the dependency chain handle it. For this task's purpose,
                 # we can't compare times, so we assume it might need to run.
-                if not input_file.exists():
+                if input_mtime_ns is None:
                     return True
-                # If any input file is newer than the latest output file, the task is stale and must be run.
-                if input_file.stat().st_mtime > latest_output_mtime:
+                # If any input file is newer than the oldest output file, the task is stale and must be run.
+                if (
+                    oldest_output_mtime_ns is not None
+                    and input_mtime_ns > oldest_output_mtime_ns
+                ):
                     return True
 
             # If all checks pass, the task is up-to-date.
@@ -96,7 +156,7 @@ class Task:
         # This is useful for tasks that only create targets, like downloading a file.
         elif self.output_files is not None and self.input_files is None:
             # The task should run if any of the output files are missing.
-            return not all(f.exists() for f in self.output_files)
+            return any(_get_mtime_ns(f, mtime_cache) is None for f in self.output_files)
 
         # Case 3: No file-based dependency checking is configured.
         # The task is always considered to need execution.
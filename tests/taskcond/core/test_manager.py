@@ -15,6 +15,27 @@ class TestTaskManager:
         manager2 = TaskManager()
         assert manager1 == manager2
 
+    def test_reset(self) -> None:
+        """
+        Tests that reset() removes all tasks but keeps the singleton instance.
+        """
+        manager = TaskManager()
+        manager.register(Task(name="A"))
+        manager.validate_cycles()
+        task_dicts = manager.task_dicts
+
+        TaskManager.reset()
+
+        assert TaskManager() is manager
+        assert len(manager.task_names) == 0
+        assert len(task_dicts) == 0
+        # The name can be registered again after a reset.
+        manager.register(Task(name="A", depends=("A",)))
+        assert task_dicts["A"].depends == ("A",)
+        # The new graph is validated from scratch.
+        with pytest.raises(ValueError, match="Cyclic dependency detected: A -> A"):
+            manager.validate_cycles()
+
     def test_register_task_success(self) -> None:
         """
         Tests successful registration of a new task.
@@ -73,9 +94,17 @@ class TestTaskManager:
         assert manager.task_dicts["A"] == task_a
         assert manager.task_dicts["B"] == task_b
 
+        # Test that the views reflect later registrations
+        task_dicts = manager.task_dicts
+        task_names = manager.task_names
+        manager.register(Task(name="C"))
+        assert task_dicts["C"].name == "C"
+        assert "C" in task_names
+        assert manager.task_dicts is task_dicts
+
         # Test that task_dicts is read-only
         with pytest.raises(TypeError):
-            manager.task_dicts["C"] = Task(name="C")  # type: ignore
+            manager.task_dicts["D"] = Task(name="D")  # type: ignore
 
     def test_validate_cycles_no_cycle(self) -> None:
         """
@@ -116,6 +145,42 @@ class TestTaskManager:
         ):
             manager.validate_cycles()
 
+    def test_validate_cycles_cycle_behind_dependent(self) -> None:
+        """
+        Tests that validate_cycles() reports only the cycle itself when
+        a task depends on a cycle (X -> A -> B -> A).
+        """
+        manager = TaskManager()
+        manager.register(Task(name="X", depends=("A",)))
+        manager.register(Task(name="A", depends=("B",)))
+        manager.register(Task(name="B", depends=("A",)))
+
+        with pytest.raises(
+            ValueError, match="Cyclic dependency detected: A -> B -> A$"
+        ):
+            manager.validate_cycles()
+
+    def test_validate_cycles_revalidates_after_register(self) -> None:
+        """
+        Tests that a successful validation is cached until `register` is called.
+        """
+        manager = TaskManager()
+        manager.register(Task(name="A", depends=("B",)))
+        manager.register(Task(name="B"))
+        manager.validate_cycles()
+        # The fingerprint of the validated graph is kept.
+        cycle_cache_key = getattr(manager, "_TaskManager__cycle_cache_key")
+        assert cycle_cache_key == (("A", ("B",)), ("B", ()))
+        # Cached result: the fingerprint is left as is
+        manager.validate_cycles()
+        assert getattr(manager, "_TaskManager__cycle_cache_key") is cycle_cache_key
+
+        manager.register(Task(name="C", depends=("C",)))
+        assert getattr(manager, "_TaskManager__cycle_cache_key") is None
+        with pytest.raises(ValueError, match="Cyclic dependency detected: C -> C"):
+            manager.validate_cycles()
+        assert getattr(manager, "_TaskManager__cycle_cache_key") is None
+
     def test_validate_cycles_unknown_dependency(self) -> None:
         """
         Tests that validate_cycles() fails if a task depends on an unregistered task.
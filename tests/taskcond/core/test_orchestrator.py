@@ -1,10 +1,14 @@
+import multiprocessing
+import os
+import threading
 import time
 from pathlib import Path
+from typing import Any
 
 import pytest
 
 from taskcond.core.manager import TaskManager
-from taskcond.core.orchestrator import TaskOrchestrator
+from taskcond.core.orchestrator import TaskOrchestrator, TaskState
 from taskcond.core.task import Task
 
 
@@ -14,6 +18,11 @@ def create_file_func(path: Path) -> None:
     path.touch()
 
 
+def write_pid_func(path: Path) -> None:
+    """A test function that writes the current process ID to a file."""
+    path.write_text(str(os.getpid()))
+
+
 def failing_func() -> None:
     """A test function that is designed to fail."""
     raise RuntimeError("This task was designed to fail.")
@@ -61,6 +70,32 @@ class TestTaskOrchestrator:
 
         assert execution_order == ["C", "B"]
 
+    def test_shared_dependency_runs_once(self) -> None:
+        """
+        Tests that a dependency shared by several tasks runs exactly once.
+        """
+        manager = TaskManager()
+        execution_order: list[str] = []
+
+        # A -> B, A -> C, B -> D, C -> D
+        for name, depends in [("A", ("B", "C")), ("B", ("D",)), ("C", ("D",))]:
+            manager.register(
+                Task(
+                    name=name,
+                    depends=depends,
+                    function=execution_order.append,
+                    args=(name,),
+                )
+            )
+        manager.register(Task(name="D", function=execution_order.append, args=("D",)))
+
+        orchestrator = TaskOrchestrator(manager)
+        orchestrator.run_tasks(["A", "B"], tqdm_disable=True)
+
+        assert execution_order[0] == "D"
+        assert sorted(execution_order[1:3]) == ["B", "C"]
+        assert execution_order[3:] == ["A"]
+
     def test_failure_propagation(self, capsys: pytest.CaptureFixture[str]) -> None:
         """
         Tests that when a task fails, its dependents are not run.
@@ -116,6 +151,110 @@ class TestTaskOrchestrator:
         # The desired outcome is that B runs even though A was skipped.
         assert file_b.is_file()
 
+    def test_dependent_sees_inputs_rewritten_during_run(self, tmp_path: Path) -> None:
+        """
+        Tests that a task whose input file is rewritten by a dependency during
+        the run is executed, even though it was up-to-date when the run started.
+        """
+        manager = TaskManager()
+        file_a = tmp_path / "a.txt"
+        file_b = tmp_path / "b.txt"
+        executed_tasks = set()
+
+        create_file_func(file_a)
+        time.sleep(0.01)  # Ensure a time difference
+        create_file_func(file_b)
+
+        def rewrite_a() -> None:
+            time.sleep(0.01)  # Ensure a time difference
+            file_a.write_text("updated")
+
+        manager.register(Task(name="A", function=rewrite_a))
+        manager.register(
+            Task(
+                name="B",
+                depends=("A",),
+                function=lambda: executed_tasks.add("B"),
+                input_files=(file_a,),
+                output_files=(file_b,),
+            )
+        )
+
+        orchestrator = TaskOrchestrator(manager)
+        orchestrator.run_tasks(["B"], tqdm_disable=True)
+
+        assert "B" in executed_tasks
+
+    def test_scanned_files_are_not_stat_again(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """
+        Tests that files scanned at the start of the run, whether they exist
+        or not, are not looked up again before a task has been executed.
+        """
+        manager = TaskManager()
+        input_file = tmp_path / "input.txt"
+        output_file = tmp_path / "output.txt"
+        create_file_func(input_file)
+
+        manager.register(
+            Task(
+                name="A",
+                function=create_file_func,
+                args=(output_file,),
+                input_files=(input_file,),
+                output_files=(output_file,),
+            )
+        )
+
+        stat_paths: list[Any] = []
+        original_stat = os.stat
+
+        def recording_stat(path: Any, *args: Any, **kwargs: Any) -> Any:
+            stat_paths.append(path)
+            return original_stat(path, *args, **kwargs)
+
+        monkeypatch.setattr(os, "stat", recording_stat)
+
+        orchestrator = TaskOrchestrator(manager)
+        orchestrator.run_tasks(["A"], tqdm_disable=True)
+
+        assert input_file not in stat_paths
+        assert output_file not in stat_paths
+        assert output_file.is_file()
+
+    def test_directory_input_is_treated_alike_during_run(self, tmp_path: Path) -> None:
+        """
+        Tests that tasks taking the same directory as input are treated alike,
+        whether they are checked before or after another task has completed.
+        """
+        manager = TaskManager()
+        input_dir = tmp_path / "inputs"
+        input_dir.mkdir()
+        executed_tasks = set()
+
+        manager.register(Task(name="A", function=lambda: executed_tasks.add("A")))
+        manager.register(
+            Task(
+                name="B",
+                function=lambda: executed_tasks.add("B"),
+                input_files=(input_dir,),
+            )
+        )
+        manager.register(
+            Task(
+                name="C",
+                depends=("A",),
+                function=lambda: executed_tasks.add("C"),
+                input_files=(input_dir,),
+            )
+        )
+
+        orchestrator = TaskOrchestrator(manager, check_freq=0.01)
+        orchestrator.run_tasks(["B", "C"], tqdm_disable=True)
+
+        assert executed_tasks == {"A"}
+
     def test_force_run_executes_all_tasks(self, tmp_path: Path) -> None:
         """
         Tests that `force=True` runs tasks even if they are up-to-date.
@@ -163,6 +302,168 @@ class TestTaskOrchestrator:
         # The total time should be closer to one sleep_time, not the sum of all three.
         assert duration < (sleep_time + mergin)
 
+    def test_dependency_chain_does_not_wait_for_check_freq(self) -> None:
+        """
+        Tests that a completed task is processed as soon as it finishes,
+        rather than at the next check for waiting tasks.
+        """
+        manager = TaskManager()
+        check_freq = 5
+        sleep_time = 0.05
+
+        # A chain of tasks, each of which is still running when submitted
+        manager.register(Task(name="A", function=lambda: time.sleep(sleep_time)))
+        manager.register(
+            Task(name="B", depends=("A",), function=lambda: time.sleep(sleep_time))
+        )
+        manager.register(
+            Task(name="C", depends=("B",), function=lambda: time.sleep(sleep_time))
+        )
+
+        orchestrator = TaskOrchestrator(manager, check_freq=check_freq)
+
+        start_time = time.time()
+        orchestrator.run_tasks(["C"], tqdm_disable=True)
+        end_time = time.time()
+
+        duration = end_time - start_time
+        # Waiting for check_freq even once would take longer than this.
+        assert duration < check_freq / 2
+
+    def test_cpu_bound_task_runs_in_separate_process(self, tmp_path: Path) -> None:
+        """
+        Tests that CPU-bound tasks are executed in a process pool, while other
+        tasks stay in the thread pool.
+        """
+        manager = TaskManager()
+        file_a = tmp_path / "a.txt"
+        file_b = tmp_path / "b.txt"
+
+        manager.register(
+            Task(name="A", function=write_pid_func, args=(file_a,), cpu_bound=True)
+        )
+        manager.register(Task(name="B", function=write_pid_func, args=(file_b,)))
+
+        orchestrator = TaskOrchestrator(manager)
+        orchestrator.run_tasks(["A", "B"], tqdm_disable=True)
+
+        assert file_a.read_text() != str(os.getpid())
+        assert file_b.read_text() == str(os.getpid())
+
+    @pytest.mark.skipif(
+        multiprocessing.get_context().get_start_method() != "fork",
+        reason="only forked workers inherit the registered tasks",
+    )
+    def test_cpu_bound_lambda_runs_in_separate_process(self, tmp_path: Path) -> None:
+        """
+        Tests that a CPU-bound task with an unpicklable lambda can run in a
+        forked process pool worker.
+        """
+        manager = TaskManager()
+        file_a = tmp_path / "a.txt"
+
+        manager.register(
+            Task(name="A", function=lambda: write_pid_func(file_a), cpu_bound=True)
+        )
+
+        orchestrator = TaskOrchestrator(manager)
+        orchestrator.run_tasks(["A"], tqdm_disable=True)
+
+        assert file_a.read_text() != str(os.getpid())
+
+    @pytest.mark.skipif(
+        multiprocessing.get_context().get_start_method() != "fork",
+        reason="only applies to forked workers",
+    )
+    def test_process_workers_are_forked_before_threads_start(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """
+        Tests that process pool workers are forked before the run starts any
+        thread, even if a thread task is submitted first.
+        """
+        manager = TaskManager()
+        file_a = tmp_path / "a.txt"
+        file_b = tmp_path / "b.txt"
+
+        manager.register(Task(name="A", function=write_pid_func, args=(file_a,)))
+        manager.register(
+            Task(name="B", function=write_pid_func, args=(file_b,), cpu_bound=True)
+        )
+
+        # Record the threads started during the run when a worker is forked.
+        threads_before_run = set(threading.enumerate())
+        new_threads_at_fork: list[set[threading.Thread]] = []
+        original_fork = os.fork
+
+        def recording_fork() -> int:
+            new_threads_at_fork.append(set(threading.enumerate()) - threads_before_run)
+            return original_fork()
+
+        monkeypatch.setattr(os, "fork", recording_fork)
+
+        orchestrator = TaskOrchestrator(manager, max_workers=2)
+        orchestrator.run_tasks(["A", "B"], tqdm_disable=True)
+
+        assert file_b.read_text() != str(os.getpid())
+        assert len(new_threads_at_fork) > 0
+        assert all(len(new_threads) == 0 for new_threads in new_threads_at_fork)
+
+    def test_use_processes_keeps_shell_tasks_in_threads(self, tmp_path: Path) -> None:
+        """
+        Tests that `use_processes=True` runs Python functions in a process pool
+        and still runs shell-only tasks.
+        """
+        manager = TaskManager()
+        file_a = tmp_path / "a.txt"
+        file_b = tmp_path / "b.txt"
+
+        manager.register(Task(name="A", function=write_pid_func, args=(file_a,)))
+        manager.register(Task(name="B", shell_command=f"touch {file_b}"))
+
+        orchestrator = TaskOrchestrator(manager, max_workers=2, use_processes=True)
+        orchestrator.run_tasks(["A", "B"], tqdm_disable=True)
+
+        assert file_a.read_text() != str(os.getpid())
+        assert file_b.is_file()
+
+    def test_repeated_runs_reuse_and_refresh_plan(self) -> None:
+        """
+        Tests that running the same targets again reuses the execution plan,
+        and that a task registered again under the same name is picked up.
+        """
+        manager = TaskManager()
+        execution_order: list[str] = []
+
+        manager.register(Task(name="A", function=execution_order.append, args=("A",)))
+        manager.register(
+            Task(
+                name="B",
+                depends=("A",),
+                function=execution_order.append,
+                args=("B",),
+            )
+        )
+
+        orchestrator = TaskOrchestrator(manager)
+        plan_cache = getattr(orchestrator, "_TaskOrchestrator__plan_cache")
+        orchestrator.run_tasks(["B"], tqdm_disable=True)
+        assert len(plan_cache) == 1
+        plan = plan_cache[("B",)]
+
+        orchestrator.run_tasks(["B"], tqdm_disable=True)
+        assert execution_order == ["A", "B", "A", "B"]
+        assert len(plan_cache) == 1
+        assert plan_cache[("B",)] is plan
+
+        TaskManager.reset()
+        manager.register(Task(name="A", function=execution_order.append, args=("a",)))
+        manager.register(Task(name="B", function=execution_order.append, args=("b",)))
+        orchestrator.run_tasks(["B"], tqdm_disable=True)
+        assert execution_order[4:] == ["b"]
+        assert len(plan_cache) == 1
+        assert plan_cache[("B",)] is not plan
+
     def test_run_with_no_targets_fails(self) -> None:
         """
         Tests that the orchestrator raises an error if no target tasks are provided.
@@ -199,3 +500,26 @@ class TestTaskOrchestrator:
 
         captured = capsys.readouterr()
         assert "Warning: No runnable tasks are currently submitted" in captured.out
+
+
+class TestTaskState:
+    """Unit tests for the TaskState class."""
+
+    def test_should_run_is_memoized(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """
+        Tests that should_run() is evaluated only once.
+        """
+        calls = []
+
+        def counting_should_run(task: Task, mtime_cache: object = None) -> bool:
+            calls.append(task.name)
+            return True
+
+        monkeypatch.setattr(Task, "should_run", counting_should_run)
+        state = TaskState.create(Task(name="A", output_files=(tmp_path / "a.txt",)))
+
+        assert state.should_run()
+        assert state.should_run()
+        assert calls == ["A"]
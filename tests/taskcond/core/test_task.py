@@ -1,3 +1,4 @@
+import sys
 import time
 from pathlib import Path
 
@@ -25,6 +26,22 @@ def func_with_args(a: int, b: str) -> None:
 class TestTask:
     """Unit tests for the Task class."""
 
+    def test_task_uses_slots(self) -> None:
+        """
+        Tests that Task instances have no per-instance __dict__.
+        """
+        task = Task(name="test", function=dummy_func)
+        assert not hasattr(task, "__dict__")
+
+    def test_depends_are_interned(self) -> None:
+        """
+        Tests that dependency names are interned and stored as a tuple.
+        """
+        dep_name = "".join(["de", "p"])
+        task = Task(name="test", depends=[dep_name])  # type: ignore[arg-type]
+        assert task.depends == ("dep",)
+        assert task.depends[0] is sys.intern("dep")
+
     def test_should_run_no_file_deps(self) -> None:
         """
         Tests that should_run() is always True when no file dependencies are specified.
@@ -87,6 +104,50 @@ class TestTask:
         )
         assert task.should_run()
 
+    def test_should_run_input_is_newer_than_oldest_output(self, tmp_path: Path) -> None:
+        """
+        Tests should_run() when an input file is newer than only some outputs.
+        """
+        input_file = tmp_path / "input.txt"
+        old_output_file = tmp_path / "old_output.txt"
+        new_output_file = tmp_path / "new_output.txt"
+
+        old_output_file.touch()
+        time.sleep(0.01)  # Ensure a time difference
+        input_file.touch()
+        time.sleep(0.01)  # Ensure a time difference
+        new_output_file.touch()
+
+        task = Task(
+            name="test",
+            function=dummy_func,
+            input_files=(input_file,),
+            output_files=(old_output_file, new_output_file),
+        )
+        assert task.should_run()
+
+    def test_should_run_uses_mtime_cache(self, tmp_path: Path) -> None:
+        """
+        Tests that should_run() prefers the given modification times over
+        the file system, including files marked as missing, and stats files
+        missing from them.
+        """
+        input_file = tmp_path / "input.txt"
+        output_file = tmp_path / "output.txt"
+        input_file.touch()
+        output_file.touch()
+
+        task = Task(
+            name="test",
+            function=dummy_func,
+            input_files=(input_file,),
+            output_files=(output_file,),
+        )
+        assert task.should_run(mtime_cache={input_file: 2, output_file: 1})
+        assert not task.should_run(mtime_cache={input_file: 1, output_file: 2})
+        assert task.should_run(mtime_cache={output_file: 0})
+        assert task.should_run(mtime_cache={input_file: 1, output_file: None})
+
     def test_should_run_output_is_missing(self, tmp_path: Path) -> None:
         """
         Tests should_run() when an output file is missing.
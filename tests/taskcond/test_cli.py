@@ -1,3 +1,5 @@
+import importlib.util
+import sys
 import textwrap
 from pathlib import Path
 
@@ -135,6 +137,17 @@ class TestRunConfig:
         assert not config.use_processes
         assert config.visible_progressbar
 
+    def test_load_from_modified_pyproject(
+        self, tomlfile: Path, taskfile: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Tests that changes to pyproject.toml are picked up by later loads."""
+        monkeypatch.chdir(tomlfile.parent)
+        assert RunConfig.load().n_jobs == 4
+
+        TaskManager.reset()
+        tomlfile.write_text(tomlfile.read_text().replace("n_jobs = 4", "n_jobs = 16"))
+        assert RunConfig.load().n_jobs == 16
+
     def test_load_kwargs_override_pyproject(
         self, tomlfile: Path, taskfile: Path, monkeypatch: pytest.MonkeyPatch
     ) -> None:
@@ -163,6 +176,17 @@ class TestRunConfig:
         assert "C" in manager.task_names
         assert manager.get_task("B").depends == ("A",)
 
+    def test_load_tasks_from_file_caches_bytecode(
+        self, taskfile: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Tests that the compiled taskfile is cached for later invocations."""
+        monkeypatch.chdir(taskfile.parent)
+        monkeypatch.setattr(sys, "dont_write_bytecode", False)
+
+        RunConfig.load()
+
+        assert Path(importlib.util.cache_from_source(str(taskfile))).is_file()
+
     def test_load_tasks_from_file_not_found(
         self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
     ) -> None: